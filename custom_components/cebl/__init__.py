@@ -1,109 +1,378 @@
 import logging
 import aiohttp
 import asyncio
-import async_timeout
-from datetime import timedelta
+import sys
+from datetime import datetime, timedelta
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers.event import async_track_time_interval
-from .const import DOMAIN, API_URL_FIXTURES, API_URL_LIVE, PLATFORMS, STARTUP_MESSAGE
+from homeassistant.util import dt
+from .const import (
+    DOMAIN,
+    API_URL_FIXTURES,
+    API_URL_LIVE,
+    PLATFORMS,
+    STARTUP_MESSAGE,
+    UPDATE_INTERVAL,
+    UPDATE_INTERVAL_LIVE,
+    UPDATE_INTERVAL_MAX,
+    GAME_DURATION,
+    PREGAME_WINDOW,
+    REQUEST_TIMEOUT,
+    LIVE_REQUEST_TIMEOUT,
+    JSON_LOADS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+def _retry_after(response):
+    """Return the delay requested by a response's Retry-After header, if any."""
+    value = response.headers.get("Retry-After", "")
+    # Only the delay-seconds form is honoured; HTTP dates are ignored
+    if value.isdigit():
+        return timedelta(seconds=int(value))
+    return None
+
+# Fields of each live match used by the sensor platform
+LIVE_SCORE_FIELDS = ("homename", "awayname", "matchStatus", "homescore", "awayscore", "period", "clock")
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up CEBL from a config entry."""
     _LOGGER.info(STARTUP_MESSAGE)
     coordinator = CEBLDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    # The coordinator owns its HTTP session, so close it if setup fails
+    try:
+        # Entries are not unloaded when Home Assistant stops
+        async def _async_close_session(_event):
+            await coordinator.async_close()
+
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+        )
+
+        await coordinator.async_config_entry_first_refresh()
+
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    for platform in PLATFORMS:
-        hass.async_create_task(
-            hass.config_entries.async_forward_entry_setup(entry, platform)
+        async def _async_daily_refresh(_now):
+            """Pick up the day's fixtures at midnight."""
+            await coordinator.async_request_refresh()
+
+        entry.async_on_unload(
+            async_track_time_change(hass, _async_daily_refresh, hour=0, minute=0, second=0)
         )
+    except Exception:
+        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        await coordinator.async_close()
+        raise
 
     _LOGGER.info("CEBL integration setup complete.")
 
-    # Schedule live score updates every minute
-    async_track_time_interval(hass, coordinator.async_update_live_scores, timedelta(minutes=1))
-
     return True
 
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a CEBL config entry."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_close()
+    return unload_ok
+
 class CEBLDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching CEBL data from the API."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
         """Initialize."""
         self.entry = entry
-        self.session = async_get_clientsession(hass)
+        # Dedicated session so idle connections to both API hosts survive
+        # between polls instead of being dropped by the default 15s keepalive.
+        # Both hostnames are fixed, so their DNS answers are cached for an hour.
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=4,
+                limit_per_host=2,
+                keepalive_timeout=700,
+                force_close=False,
+                use_dns_cache=True,
+                ttl_dns_cache=3600,
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
         self.url_fixtures = API_URL_FIXTURES
         self.url_live = API_URL_LIVE
-        self.teams = entry.data.get("teams", [])
-        _LOGGER.info(f"Initializing CEBLDataUpdateCoordinator with teams: {self.teams}")
+        # Explicitly request a JSON response from the live-score feed
+        self._live_headers = {"Accept": "application/json"}
+        self.teams = frozenset(sys.intern(str(team)) for team in entry.data.get("teams", []))
+        self._etag = None
+        self._last_modified = None
+        self._fixtures_hash = None
+        self._live_hash = None
+        # Unfiltered live scores for _live_hash, re-filtered on every refresh
+        self._live_scores = None
+        self._retry_after = None
+        self._live_paused_until = None
+        _LOGGER.info("Initializing CEBLDataUpdateCoordinator with teams: %s", self.teams)
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=10),
+            update_interval=UPDATE_INTERVAL,
         )
 
+    async def async_close(self):
+        """Close the HTTP session owned by the coordinator."""
+        await self.session.close()
+
     async def _async_update_data(self):
         """Update data via library."""
-        _LOGGER.info("Fetching CEBL data from API.")
+        _LOGGER.debug("Fetching CEBL data from API.")
+        # Live scores are only needed around a tracked fixture's game window.
+        # Start times rarely change, so the previous fixtures decide this
+        # and the two independent requests can still overlap.
+        previous = self.data
+        in_live_window = previous is None or self._in_live_window(previous["fixtures"])
+        fetch_live = in_live_window and (
+            self._live_paused_until is None or dt.utcnow() >= self._live_paused_until
+        )
+        requests = [self._fetch_fixtures()]
+        if fetch_live:
+            requests.append(self._fetch_live_scores())
+        # Let the live request finish even if the fixtures one fails, so it
+        # is never left running on its own after this refresh has given up
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        fixtures = results[0]
+        if isinstance(fixtures, BaseException):
+            self._back_off()
+            raise fixtures
+        live_result = results[1] if fetch_live else None
+        live_scores = None
+        if isinstance(live_result, tuple):
+            # Only remember the body once its scores are actually published
+            self._live_hash, live_scores = live_result
+            self._live_scores = live_scores
+        # The coordinator picks up the new interval when it schedules the next refresh
+        self.update_interval = UPDATE_INTERVAL_LIVE if self._in_live_window(fixtures) else UPDATE_INTERVAL
+        if live_scores is None and in_live_window and previous:
+            # The live request failed or is paused by Retry-After; keep the
+            # last scores rather than blanking a game that is still on
+            live_scores = self._live_scores
+        elif not in_live_window:
+            # Outside every game window there is nothing live to show
+            live_scores = []
+            self._live_hash = None
+            self._live_scores = None
+        data = {"fixtures": fixtures, "fixtures_by_team": self._index_fixtures_by_team(fixtures)}
+        if live_scores is not None:
+            live_scores = self._filter_live_scores(live_scores, fixtures)
+            data["live_scores"] = live_scores
+            data["live_by_team_name"] = self._index_live_scores_by_team(live_scores)
+        return data
+
+    async def _fetch_fixtures(self):
+        """Fetch the fixtures involving the configured teams."""
+        if not self.teams:
+            # No fixture can match, so skip the request entirely
+            return []
         try:
-            async with async_timeout.timeout(10):
-                async with self.session.get(self.url_fixtures) as response:
-                    if response.status != 200:
-                        _LOGGER.error(f"Invalid response from API: {response.status}")
-                        raise UpdateFailed(f"Invalid response from API: {response.status}")
-                    data = await response.json()
-                    _LOGGER.debug(f"Fetched data: {data}")
-                    fixtures = [fixture for fixture in data["fixtures"] 
-                                if str(fixture["homeTeam"]["id"]) in self.teams or str(fixture["awayTeam"]["id"]) in self.teams]
-                    _LOGGER.info(f"Fetched fixtures: {fixtures}")
-                    return {"fixtures": fixtures}
+            headers = {}
+            # Without parsed fixtures to fall back on, a 304 would be useless
+            if self.data is not None:
+                if self._etag:
+                    headers["If-None-Match"] = self._etag
+                if self._last_modified:
+                    headers["If-Modified-Since"] = self._last_modified
+            session, url = self.session, self.url_fixtures
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and self.data is not None:
+                    _LOGGER.debug("Fixtures not modified since last fetch")
+                    return self.data["fixtures"]
+                if response.status != 200:
+                    _LOGGER.error("Invalid response from API: %s", response.status)
+                    self._retry_after = _retry_after(response)
+                    raise UpdateFailed(f"Invalid response from API: {response.status}")
+                body = await response.read()
+                # Servers that ignore the validators still often send the same body
+                body_hash = hash(body)
+                if body_hash == self._fixtures_hash and self.data is not None:
+                    _LOGGER.debug("Fixtures payload unchanged since last fetch")
+                    # The body matches what we already parsed, so the new
+                    # validators are safe to adopt and keep 304s working
+                    self._etag = response.headers.get("ETag")
+                    self._last_modified = response.headers.get("Last-Modified")
+                    return self.data["fixtures"]
+                data = JSON_LOADS(body)
+                _LOGGER.debug("Fetched data: %s", data)
+                teams = self.teams
+                # Team IDs are normalised to interned strings once here so the
+                # sensors can compare them against their own IDs without converting
+                matches = [
+                    (home_id, away_id, fixture) for home_id, away_id, fixture in (
+                        (
+                            sys.intern(str(fixture["homeTeam"]["id"])),
+                            sys.intern(str(fixture["awayTeam"]["id"])),
+                            fixture,
+                        )
+                        for fixture in data["fixtures"]
+                    )
+                    if home_id in teams or away_id in teams
+                ]
+                # Release the full payload before post-processing the matches
+                del body, data
+                fixtures = [
+                    self._slim_fixture(fixture, home_id, away_id)
+                    for home_id, away_id, fixture in matches
+                ]
+                _LOGGER.debug("Fetched fixtures: %s", fixtures)
+                # Only trust the validators once the payload has been processed,
+                # so a 304 never masks a response we failed to handle
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
+                self._fixtures_hash = body_hash
+                return fixtures
         except aiohttp.ClientError as err:
-            _LOGGER.error(f"HTTP error fetching teams: {err}")
+            _LOGGER.error("HTTP error fetching teams: %s", err)
             raise UpdateFailed(f"HTTP error fetching teams: {err}")
         except asyncio.TimeoutError:
             _LOGGER.error("Timeout error fetching teams")
             raise UpdateFailed("Timeout error fetching teams")
         except Exception as err:
-            _LOGGER.error(f"Unexpected error fetching teams: {err}")
+            _LOGGER.error("Unexpected error fetching teams: %s", err)
             raise UpdateFailed(f"Unexpected error fetching teams: {err}")
 
-    async def async_update_live_scores(self, _):
-        """Fetch live score data from the API."""
-        _LOGGER.info("Fetching live CEBL scores from API.")
+    @staticmethod
+    def _slim_fixture(fixture, home_id, away_id):
+        """Return the parts of a feed fixture the sensors use."""
+        # Parse the start date once per fetch rather than on every sensor update
+        start_date_str = fixture["startDate"]
+        start_date = dt.parse_datetime(start_date_str)
+        if not start_date:
+            start_date = datetime.fromisoformat(start_date_str.replace("Z", "+00:00"))
+        start_date_local = dt.as_local(start_date)
+        home_team = fixture["homeTeam"]
+        away_team = fixture["awayTeam"]
+        return {
+            "id": fixture["id"],
+            "startDate": start_date_str,
+            "_start": start_date,
+            "_start_local_iso": start_date_local.isoformat(),
+            "homeTeam": {"id": home_id, "name": home_team.get("name"), "logo": home_team.get("logo")},
+            "awayTeam": {"id": away_id, "name": away_team.get("name"), "logo": away_team.get("logo")},
+            "stadium": {"name": (fixture.get("stadium") or {}).get("name")},
+        }
+
+    def _index_fixtures_by_team(self, fixtures):
+        """Map each configured team ID to its in-progress or next fixture.
+
+        A team with nothing left on the schedule maps to its most recent
+        finished fixture instead.
+        """
+        teams = self.teams
+        finished_before = (dt.utcnow() - GAME_DURATION).timestamp()
+        fixtures_by_team = {}
+        best_keys = {}
+        for fixture in fixtures:
+            start = fixture["_start"].timestamp()
+            # Unfinished fixtures sort first, earliest first; finished ones latest first
+            key = (0, start) if start >= finished_before else (1, -start)
+            for team_id in (fixture["homeTeam"]["id"], fixture["awayTeam"]["id"]):
+                if team_id in teams and (team_id not in best_keys or key < best_keys[team_id]):
+                    best_keys[team_id] = key
+                    fixtures_by_team[team_id] = fixture
+        return fixtures_by_team
+
+    def _back_off(self):
+        """Double the poll interval, up to a limit, while updates keep failing.
+
+        The next successful update resets it from the fixture schedule.
+        """
+        interval = min(self.update_interval * 2, UPDATE_INTERVAL_MAX)
+        if self._retry_after is not None:
+            # Never poll again sooner than the API asked us to
+            interval = max(interval, self._retry_after)
+            self._retry_after = None
+        self.update_interval = interval
+
+    def _filter_live_scores(self, live_scores, fixtures):
+        """Keep only unfinished live matches involving a configured team."""
+        teams = self.teams
+        team_names = {
+            team["name"]
+            for fixture in fixtures
+            for team in (fixture["homeTeam"], fixture["awayTeam"])
+            if team["id"] in teams
+        }
+        return [
+            match for match in live_scores
+            if match.get("matchStatus") != "COMPLETE"
+            and (match.get("homename") in team_names or match.get("awayname") in team_names)
+        ]
+
+    @staticmethod
+    def _index_live_scores_by_team(live_scores):
+        """Map each team name to its live match, preferring one in progress."""
+        live_by_team_name = {}
+        for match in live_scores:
+            for team_name in (match.get("homename"), match.get("awayname")):
+                if team_name is not None and (
+                    team_name not in live_by_team_name or match.get("matchStatus") == "IN_PROGRESS"
+                ):
+                    live_by_team_name[team_name] = match
+        return live_by_team_name
+
+    @staticmethod
+    def _in_live_window(fixtures):
+        """Return True from shortly before tip-off of a fixture until it is over."""
+        now = dt.utcnow()
+        earliest_start = now - GAME_DURATION
+        latest_start = now + PREGAME_WINDOW
+        return any(earliest_start <= fixture["_start"] <= latest_start for fixture in fixtures)
+
+    async def _fetch_live_scores(self):
+        """Fetch live score data from the API.
+
+        Returns a (body hash, live scores) tuple, or None on failure.
+        """
+        _LOGGER.debug("Fetching live CEBL scores from API.")
         try:
-            async with async_timeout.timeout(10):
-                headers = {
-                    'Accept': 'application/json'  # Explicitly request JSON response
-                }
-                async with self.session.get(self.url_live, headers=headers) as response:
-                    if response.status != 200:
-                        _LOGGER.error(f"Invalid response from API: {response.status}")
-                        return
-
-                    # Read the raw text first
-                    text_data = await response.text()
-                    
-                    try:
-                        # Try to parse it as JSON regardless of content type
-                        import json
-                        live_data = json.loads(text_data)
-                        _LOGGER.debug(f"Fetched live data: {live_data}")
-                        self.data.update({"live_scores": live_data})
-                        self.async_set_updated_data(self.data)
-                    except json.JSONDecodeError as err:
-                        _LOGGER.error(f"Failed to parse JSON response: {err}")
-                        
+            session, url = self.session, self.url_live
+            async with session.get(url, headers=self._live_headers, timeout=LIVE_REQUEST_TIMEOUT) as response:
+                if response.status != 200:
+                    _LOGGER.error("Invalid response from API: %s", response.status)
+                    retry_after = _retry_after(response)
+                    if retry_after is not None:
+                        self._live_paused_until = dt.utcnow() + retry_after
+                    return None
+
+                body = await response.read()
+                # Scores often stay the same between polls (timeouts, breaks)
+                body_hash = hash(body)
+                if body_hash == self._live_hash and self._live_scores is not None:
+                    _LOGGER.debug("Live scores unchanged since last fetch")
+                    return body_hash, self._live_scores
+                try:
+                    # Parse the raw body as JSON regardless of content type
+                    live_data = JSON_LOADS(body)
+                except ValueError as err:
+                    _LOGGER.error("Failed to parse JSON response: %s", err)
+                    return None
+                _LOGGER.debug("Fetched live data: %s", live_data)
+                # Keep only the fields the sensors read so the full
+                # payload is not retained in the coordinator data
+                if not isinstance(live_data, list):
+                    return body_hash, []
+                return body_hash, [
+                    {key: match[key] for key in LIVE_SCORE_FIELDS if key in match}
+                    for match in live_data
+                    if isinstance(match, dict)
+                ]
         except aiohttp.ClientError as err:
-            _LOGGER.error(f"HTTP error fetching live scores: {err}")
+            _LOGGER.error("HTTP error fetching live scores: %s", err)
         except asyncio.TimeoutError:
             _LOGGER.error("Timeout error fetching live scores")
         except Exception as err:
-            _LOGGER.error(f"Unexpected error fetching live scores: {err}")
+            _LOGGER.error("Unexpected error fetching live scores: %s", err)
+        return None
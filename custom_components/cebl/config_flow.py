@@ -1,14 +1,21 @@
 """Config flow for CEBL integration."""
 from homeassistant import config_entries
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 import aiohttp
-import async_timeout
+import asyncio
 import logging
+import time
+from operator import itemgetter
 
-from .const import DOMAIN
+from .const import DOMAIN, API_URL_FIXTURES, REQUEST_TIMEOUT, JSON_LOADS
 
 _LOGGER = logging.getLogger(__name__)
 
+# The team list changes a few times a year at most, so keep it for a while
+TEAMS_CACHE_TTL = 6 * 60 * 60
+_TEAMS_CACHE = {"ts": 0.0, "value": None}
+
 class CEBLConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for CEBL."""
 
@@ -30,9 +37,6 @@ class CEBLConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors["base"] = "cannot_connect"
             teams = []
 
-        # Sort teams alphabetically by name
-        teams.sort(key=lambda team: team["name"])
-
         self.team_options = {str(team["id"]): team["name"] for team in teams}  # Ensure team IDs are strings
         self.team_options_reverse = {v: k for k, v in self.team_options.items()}  # Reverse map for lookups
 
@@ -45,25 +49,23 @@ class CEBLConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
     async def _fetch_teams(self):
-        """Fetch the list of teams from the API."""
-        url = "https://api.streamplay.streamamg.com/fixtures/basketball/p/3001497?q=(type:fixture)&offset=0&limit=25"
+        """Fetch the list of teams from the API, sorted alphabetically by name."""
+        if _TEAMS_CACHE["value"] is not None and time.monotonic() - _TEAMS_CACHE["ts"] < TEAMS_CACHE_TTL:
+            return _TEAMS_CACHE["value"]
         try:
-            async with async_timeout.timeout(10):
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to fetch teams: %s", response.status)
-                            return None
-                        data = await response.json()
-                        teams = []
-                        for fixture in data["fixtures"]:
-                            home_team = fixture["homeTeam"]
-                            away_team = fixture["awayTeam"]
-                            if home_team not in teams:
-                                teams.append(home_team)
-                            if away_team not in teams:
-                                teams.append(away_team)
-                        return teams
+            session = async_get_clientsession(self.hass)
+            async with session.get(API_URL_FIXTURES, timeout=REQUEST_TIMEOUT) as response:
+                if response.status != 200:
+                    _LOGGER.error("Failed to fetch teams: %s", response.status)
+                    return None
+                data = JSON_LOADS(await response.read())
+                teams_by_id = {}
+                for fixture in data["fixtures"]:
+                    teams_by_id.setdefault(fixture["homeTeam"]["id"], fixture["homeTeam"])
+                    teams_by_id.setdefault(fixture["awayTeam"]["id"], fixture["awayTeam"])
+                teams = sorted(teams_by_id.values(), key=itemgetter("name"))
+                _TEAMS_CACHE.update(ts=time.monotonic(), value=teams)
+                return teams
         except aiohttp.ClientError as err:
             _LOGGER.error("HTTP error fetching teams: %s", err)
         except asyncio.TimeoutError:
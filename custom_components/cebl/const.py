@@ -1,7 +1,30 @@
 """Constants for the CEBL integration."""
+from datetime import timedelta
+
+from aiohttp import ClientTimeout
+
+# Both feeds are decoded from raw bytes; orjson is used when it is installed
+try:
+    from orjson import loads as JSON_LOADS
+except ImportError:
+    from json import loads as JSON_LOADS
 
 DOMAIN = "cebl"
 PLATFORMS = ["sensor"]
 STARTUP_MESSAGE = "Starting CEBL integration"
 API_URL_FIXTURES = "https://api.streamplay.streamamg.com/fixtures/basketball/p/3001497?q=(type:fixture)&offset=0&limit=25"
 API_URL_LIVE = "https://fibalivestats.dcd.shared.geniussports.com/data/competition/37308.json"
+# Connect and read timeouts track actual socket progress, so a busy event
+# loop (e.g. during Home Assistant startup) does not time out healthy requests
+REQUEST_TIMEOUT = ClientTimeout(total=15, sock_connect=5, sock_read=10)
+# Live scores are best effort and polled often, so give up on them sooner
+LIVE_REQUEST_TIMEOUT = ClientTimeout(total=8, sock_connect=3, sock_read=5)
+
+UPDATE_INTERVAL = timedelta(minutes=10)
+UPDATE_INTERVAL_LIVE = timedelta(seconds=30)
+# Upper bound for the interval while backing off after failed updates
+UPDATE_INTERVAL_MAX = timedelta(hours=1)
+# How long after tip-off a fixture is considered in progress
+GAME_DURATION = timedelta(hours=4)
+# How long before tip-off to switch to the live update interval
+PREGAME_WINDOW = timedelta(minutes=15)
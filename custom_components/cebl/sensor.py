@@ -1,15 +1,14 @@
 import logging
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+import sys
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import format_mac
-from homeassistant.helpers.event import async_track_time_change, async_track_time_interval
 from homeassistant.util import dt
 
-from .const import DOMAIN
+from .const import DOMAIN, GAME_DURATION
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,22 +23,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     if not sensors:
         _LOGGER.error("No sensors to add. Check team ID configuration.")
     else:
-        _LOGGER.debug(f"Adding sensors: {sensors}")
-
-    async_add_entities(sensors, True)
+        _LOGGER.debug("Adding sensors: %s", sensors)
+
+    _async_migrate_unique_ids(hass, sensors)
+
+    async_add_entities(sensors)
+
+def _async_migrate_unique_ids(hass: HomeAssistant, sensors):
+    """Move entities off unique IDs that were mangled by format_mac."""
+    registry = er.async_get(hass)
+    for sensor in sensors:
+        legacy_id = format_mac(sensor.unique_id)
+        if legacy_id == sensor.unique_id:
+            continue
+        # Renaming onto an existing unique ID would raise and abort setup
+        if registry.async_get_entity_id("sensor", DOMAIN, sensor.unique_id) is not None:
+            continue
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, legacy_id)
+        if entity_id is not None:
+            registry.async_update_entity(entity_id, new_unique_id=sensor.unique_id)
 
 class CEBLSensor(CoordinatorEntity, Entity):
     def __init__(self, hass: HomeAssistant, coordinator: DataUpdateCoordinator, team_id):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.hass = hass
-        self._team_id = str(team_id)
+        self._team_id = sys.intern(str(team_id))
         self._state = None
         self._attributes = {}
-        self._unique_id = format_mac(f"cebl_{self._team_id}")
-
-        async_track_time_interval(self.hass, self._update_live_score, timedelta(seconds=30))
-        async_track_time_change(self.hass, self._update_daily_fixtures, hour=0, minute=0, second=0)
+        self._parsed_fixture = None
+        self._last_available = None
+        self._fixture_attributes = {}
+        self._unique_id = f"cebl_{self._team_id}"
+        # The coordinator has already refreshed, and the entity_id is built
+        # from the name (team_name) before the entity is added
+        self._update_state(write_state=False)
 
     @property
     def name(self):
@@ -60,61 +78,61 @@ class CEBLSensor(CoordinatorEntity, Entity):
     async def async_added_to_hass(self):
         """Run when entity about to be added to Home Assistant."""
         self.async_on_remove(self.coordinator.async_add_listener(self._update_state))
-        self._update_state()
+        # The platform writes the initial state as soon as this returns
+        self._update_state(write_state=False)
 
-    async def async_update(self):
-        """Update the sensor state."""
-        _LOGGER.debug(f"async_update called for team ID {self._team_id}")
-        await self.coordinator.async_request_refresh()
-        self._update_state()
-
-    def _update_state(self):
+    @callback
+    def _update_state(self, write_state=True):
         data = self.coordinator.data
-        _LOGGER.debug(f"Updating sensor for team ID {self._team_id} with data: {data}")
-
-        for fixture in data.get('fixtures', []):
-            home_team_id = str(fixture['homeTeam']['id'])
-            away_team_id = str(fixture['awayTeam']['id'])
-            _LOGGER.debug(f"Checking fixture: {fixture['id']}, Home Team ID: {home_team_id}, Away Team ID: {away_team_id}")
-
-            if home_team_id == self._team_id or away_team_id == self._team_id:
-                _LOGGER.debug(f"Match found for team ID {self._team_id} in fixture {fixture['id']}")
-                self._attributes.update(self._parse_fixture(fixture))
-                self._state = self._determine_state(fixture)
-                break
+        _LOGGER.debug("Updating sensor for team ID %s with data: %s", self._team_id, data)
+        previous_state = self._state
+        changed = False
+
+        fixture = data.get('fixtures_by_team', {}).get(self._team_id)
+        if fixture is not None:
+            _LOGGER.debug("Match found for team ID %s in fixture %s", self._team_id, fixture['id'])
+            now = dt.utcnow()
+            changed = self._apply_attributes(self._parse_fixture(fixture, now))
+            self._state = self._determine_state(fixture, now)
         else:
-            _LOGGER.debug(f"No match found for team ID {self._team_id}")
+            _LOGGER.debug("No match found for team ID %s", self._team_id)
             if not self._state or self._state != 'IN':
                 self._state = 'No upcoming fixture'
 
-        if self.entity_id:
+        # Live scores are refreshed by the coordinator during game windows
+        match = self._get_live_match()
+        if self._is_match_live(match):
+            changed = self._update_live_data(match) or changed
+
+        # Unchanged refreshes (e.g. between games) need no state write, but a
+        # failed refresh leaves the data as is and must still mark us unavailable
+        available = self.available
+        if write_state and self.entity_id and (
+            changed or self._state != previous_state or available != self._last_available
+        ):
             self.async_write_ha_state()
+        self._last_available = available
+
+    def _apply_attributes(self, attributes):
+        """Merge attributes into the sensor's, returning True if any changed."""
+        if attributes.items() <= self._attributes.items():
+            return False
+        self._attributes.update(attributes)
+        return True
 
-    async def _update_live_score(self, _):
-        """Fetch and update live score data."""
-        _LOGGER.debug(f"Updating live score for team ID {self._team_id}")
-        if self._is_match_live():
-            await self.coordinator.async_update_live_scores(None)
-            self._update_live_data()
-
-    def _is_match_live(self):
-        live_data = self.coordinator.data.get('live_scores', [])
-        for match in live_data:
-            if match['homename'] == self._attributes.get('team_name') or match['awayname'] == self._attributes.get('team_name'):
-                if match['matchStatus'] == 'IN_PROGRESS':
-                    return True
-        return False
-
-    def _update_live_data(self):
-        live_data = self.coordinator.data.get('live_scores', [])
-        for match in live_data:
-            if match['homename'] == self._attributes.get('team_name') or match['awayname'] == self._attributes.get('team_name'):
-                _LOGGER.debug(f"Live match found for team: {self._attributes.get('team_name')}")
-                self._attributes.update(self._parse_live_data(match))
-                self._state = self._determine_live_state(match)
-                if self.entity_id:
-                    self.async_write_ha_state()
-                break
+    def _get_live_match(self):
+        live_by_team_name = self.coordinator.data.get('live_by_team_name', {})
+        return live_by_team_name.get(self._attributes.get('team_name'))
+
+    @staticmethod
+    def _is_match_live(match):
+        return match is not None and match['matchStatus'] == 'IN_PROGRESS'
+
+    def _update_live_data(self, match):
+        _LOGGER.debug("Live match found for team: %s", self._attributes.get('team_name'))
+        # Only in-progress matches reach here; finished ones are dropped upstream
+        self._state = 'IN'
+        return self._apply_attributes(self._parse_live_data(match))
 
     def _parse_live_data(self, match):
         return {
@@ -125,61 +143,42 @@ class CEBLSensor(CoordinatorEntity, Entity):
             'match_clock': match.get('clock', 'Unknown'),
         }
 
-    def _determine_live_state(self, match):
-        if match['matchStatus'] == 'IN_PROGRESS':
-            return 'IN'
-        elif match['matchStatus'] == 'COMPLETE':
-            return 'POST'
-        else:
-            return 'PRE'
-
-    async def _update_daily_fixtures(self, _):
-        """Check daily for upcoming fixtures and update the entity."""
-        _LOGGER.debug(f"Checking for upcoming fixtures daily for team ID {self._team_id}")
-        await self.coordinator.async_request_refresh()
-        self._update_state()
-
-    def _parse_fixture(self, fixture):
-        home_team = fixture['homeTeam']
-        away_team = fixture['awayTeam']
-        is_home_team = str(home_team['id']) == self._team_id
-
-        # Parse the UTC date using Home Assistant's utility
-        start_date_utc = dt.parse_datetime(fixture['startDate'])
-        if not start_date_utc:
-            start_date_utc = datetime.fromisoformat(fixture['startDate'].replace('Z', '+00:00'))
-        
-        # Convert to local time using Home Assistant's time zone
-        start_date_local = dt.as_local(start_date_utc)
+    def _parse_fixture(self, fixture, now):
+        # The coordinator reuses fixture objects while the feed is unchanged,
+        # so the home/away split only needs redoing when the fixture changes
+        if fixture is not self._parsed_fixture:
+            home_team = fixture['homeTeam']
+            away_team = fixture['awayTeam']
+            is_home_team = home_team['id'] == self._team_id
+            team, opponent = (home_team, away_team) if is_home_team else (away_team, home_team)
+            self._fixture_attributes = {
+                'venue': fixture.get('stadium', {}).get('name'),
+                'team_name': team['name'],
+                'team_logo': team['logo'],
+                'opponent_name': opponent['name'],
+                'opponent_homeaway': 'away' if is_home_team else 'home',
+                'opponent_logo': opponent['logo'],
+            }
+            self._parsed_fixture = fixture
 
         return {
-            'date': start_date_local.isoformat(),
-            'kickoff_in': self._get_kickoff_in(start_date_local),
-            'venue': fixture.get('stadium', {}).get('name'),
-            'team_name': home_team['name'] if is_home_team else away_team['name'],
-            'team_logo': home_team['logo'] if is_home_team else away_team['logo'],
-            'opponent_name': away_team['name'] if is_home_team else home_team['name'],
-            'opponent_homeaway': 'away' if is_home_team else 'home',
-            'opponent_logo': away_team['logo'] if is_home_team else home_team['logo'],
+            'date': fixture['_start_local_iso'],
+            'kickoff_in': self._get_kickoff_in(fixture['_start'], now),
+            **self._fixture_attributes,
         }
 
-    def _determine_state(self, fixture):
-        start_date_utc = dt.parse_datetime(fixture['startDate'])
-        if not start_date_utc:
-            start_date_utc = datetime.fromisoformat(fixture['startDate'].replace('Z', '+00:00'))
-        
-        start_date_local = dt.as_local(start_date_utc)
-        now = dt.now()
+    def _determine_state(self, fixture, now):
+        # Aware datetimes compare across zones, so skip the local conversion
+        start_date = fixture['_start']
 
-        if now < start_date_local:
+        if now < start_date:
             return 'PRE'
-        elif now > start_date_local + timedelta(hours=4):
+        elif now > start_date + GAME_DURATION:
             return 'POST'
         else:
             return 'IN'
 
-    def _get_kickoff_in(self, start_date):
-        now = dt.now()
+    def _get_kickoff_in(self, start_date, now):
         delta = start_date - now
         days, seconds = delta.days, delta.seconds
         hours = seconds // 3600